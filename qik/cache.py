@@ -36,6 +36,12 @@ class Entry(msgspec.Struct, frozen=True):
     log: str | None = None
 
 
+@qik.func.cache
+def _manifest_decoder() -> msgspec.json.Decoder[Manifest]:
+    """A reusable decoder for cache manifests."""
+    return msgspec.json.Decoder(Manifest)
+
+
 def _walk_artifacts(runnable: Runnable) -> Iterator[pathlib.Path]:
     """Walk artifact globs of a runnable."""
     for artifact in set(runnable.artifacts):
@@ -83,7 +89,7 @@ class Cache:
         manifest_path = self.manifest_path(runnable=runnable, hash=hash)
 
         def _get_entry() -> Entry:
-            manifest = msgspec.json.decode(manifest_path.read_bytes(), type=Manifest)
+            manifest = _manifest_decoder().decode(manifest_path.read_bytes())
             if manifest.hash != hash:
                 raise FileNotFoundError("Manifest not found.")
 
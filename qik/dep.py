@@ -199,7 +199,7 @@ class Load(Dep, frozen=True):
     def load(self) -> Serialized | None:
         """Get the loaded dependencies."""
         try:
-            return msgspec.json.decode(pathlib.Path(self.val).read_bytes(), type=Serialized)
+            return _serialized_decoder().decode(pathlib.Path(self.val).read_bytes())
         except (FileNotFoundError, msgspec.DecodeError):
             return None
 
@@ -222,6 +222,12 @@ class Serialized(msgspec.Struct, frozen=True, omit_defaults=True):
     hash: str | None = None
 
 
+@qik.func.cache
+def _serialized_decoder() -> msgspec.json.Decoder[Serialized]:
+    """A reusable decoder for serialized dependencies."""
+    return msgspec.json.Decoder(Serialized)
+
+
 @qik.func.cache
 def base() -> list[Dep]:
     """The base dependencies for the project."""
@@ -15,7 +15,6 @@ _RUN_CACHED_PROPS: Final[list[tuple[dict, str]]] = []
 
 cache = functools.cache
 lru_cache = functools.lru_cache
-cached_property = functools.cached_property
 
 
 def per_run_cache(func: Callable[P, T]) -> Callable[P, T]:
@@ -29,16 +28,20 @@ def per_run_cache(func: Callable[P, T]) -> Callable[P, T]:
 _NOT_FOUND = object()
 
 
-class per_run_cached_property(functools.cached_property):
+class cached_property(functools.cached_property):
+    """A cached property that doesn't lock.
+
+    Before python 3.12, functools.cached_property holds a lock shared by every instance
+    of the class, serializing threaded runnables. Like python 3.12, the property may be
+    computed more than once under contention.
+    """
+
     def __get__(self, instance, owner=None):
-        try:
-            val = instance.__dict__.get(self.attrname, _NOT_FOUND)
-            if val is _NOT_FOUND:
-                val = self.func(instance)
-                instance.__dict__[self.attrname] = val
-                _RUN_CACHED_PROPS.append((instance.__dict__, self.attrname))  # type: ignore
+        if instance is None:
+            return self
 
-            return val
+        try:
+            cache = instance.__dict__
         except AttributeError:
             msg = (
                 f"No '__dict__' attribute on {type(instance).__name__!r} "
@@ -46,6 +49,22 @@ class per_run_cached_property(functools.cached_property):
             )
             raise TypeError(msg) from None
 
+        val = cache.get(self.attrname, _NOT_FOUND)
+        if val is _NOT_FOUND:
+            val = self.func(instance)
+            cache[self.attrname] = val
+            self._on_cache(instance)
+
+        return val
+
+    def _on_cache(self, instance) -> None:
+        pass
+
+
+class per_run_cached_property(cached_property):
+    def _on_cache(self, instance) -> None:
+        _RUN_CACHED_PROPS.append((instance.__dict__, self.attrname))  # type: ignore
+
 
 def clear_per_run_cache() -> None:
     """Clear all run cache."""
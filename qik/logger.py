@@ -72,6 +72,9 @@ class Stats:
         }
         self.cached_runnables = []
 
+        # Track whether the manifest needs to be re-written
+        self._dirty = True
+
     @property
     def run_failed(self) -> bool:
         return any(status == "failed" for status in self.cmd_status.values())
@@ -82,6 +85,8 @@ class Stats:
     def finish(
         self, runnable: Runnable, *, result: Result | None, cache_entry: Entry | None
     ) -> None:
+        self._dirty = True
+
         # Track runnable status
         if not result:
             self.runnable_status[runnable.name] = "skipped"
@@ -108,6 +113,9 @@ class Stats:
                 self.cmd_status[runnable.cmd] = "success"
 
     def write(self) -> None:
+        if not self._dirty:
+            return
+
         qik.file.write(
             self.manifest_path,
             msgspec.json.encode(
@@ -119,6 +127,7 @@ class Stats:
                 )
             ),
         )
+        self._dirty = False
 
 
 class Logger:
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import re
 from typing import TYPE_CHECKING, Iterator
 
 import msgspec
@@ -36,8 +35,9 @@ class GraphConfDep(qik.dep.Val, frozen=True, dict=True):
 
     @qik.func.cached_property
     def vals(self) -> list[str]:  # type: ignore
+        # Store a digest of the config so that dependency hashing doesn't process the full JSON
         conf = qik.pygraph.conf.get()
-        return [str(msgspec.json.encode(conf))]
+        return [qik.hash.val(msgspec.json.encode(conf))]
 
 
 @qik.func.cache
@@ -67,71 +67,73 @@ def lock_cmd(runnable: qik.runnable.Runnable) -> tuple[int, str]:
 
     graph = load_graph()
     # TODO: Better error if the module doesn't exist
-    upstream = graph.upstream_modules(pyimport, idx=False)
-    root = graph.modules[graph.modules_idx[pyimport]]
+    upstream = graph.upstream_modules(pyimport, idx=True)
+    root = graph.modules_idx[pyimport]
     distributions = runnable.resolved_venv.packages_distributions()
 
     def _gen_upstream_globs() -> Iterator[str]:
-        for module in [root, *upstream]:
+        # Modules are sorted by import path, so iterating them in index order
+        # generates globs that are already sorted
+        for idx in sorted({root, *upstream}):
+            module = graph.modules[idx]
             if module.is_internal:
-                path = module.imp.replace(".", "/")
-                yield f"{path}/**.py"
-                yield f"{path}.py"
+                yield f"{module.path}.py"
+                yield f"{module.path}/**.py"
 
     def _gen_upstream_pydists() -> Iterator[str]:
-        for module in upstream:
+        ignore_missing_modules = qik.conf.project().pydist.ignore_missing_modules
+        for idx in upstream:
+            module = graph.modules[idx]
             if not module.is_internal:
                 try:
                     yield from (pydist for pydist in distributions[module.imp] if pydist)
                 except KeyError as exc:
-                    raise qik.errors.DistributionNotFound(
-                        f'No distribution found for module "{module.imp}"'
-                    ) from exc
+                    if not ignore_missing_modules:
+                        raise qik.errors.DistributionNotFound(
+                            f'No distribution found for module "{module.imp}"'
+                        ) from exc
 
     runnable.store_deps(
         qik.pygraph.utils.lock_path(pyimport, runnable.space, rel=False),
-        globs=sorted(_gen_upstream_globs()),
+        globs=list(_gen_upstream_globs()),
         pydists=sorted(_gen_upstream_pydists()),
     )
     return 0, ""
 
 
-def _generate_fence_regex(valid_imports) -> re.Pattern:
-    valid_paths = "|".join(re.escape(imp) + r"(?:\.[^:]+)?" for imp in valid_imports)
-    pattern = rf"^({valid_paths}):(?!({valid_paths})(?:\.|$)).*$"
-    return re.compile(pattern, re.MULTILINE)
+@qik.func.per_run_cache
+def _fence_trie(valid_imports: frozenset[str]) -> qik.pygraph.core.PrefixTrie:
+    """Build a prefix trie of imports that are valid within a fence."""
+    return qik.pygraph.core.PrefixTrie(valid_imports)
 
 
 def check_cmd(runnable: qik.runnable.Runnable) -> tuple[int, str]:
     graph = load_graph()
     # TODO: Handle custom PYTHONPATH env var
     fence_pyimports = runnable.resolved_space.fence_pyimports
-    imps: set[tuple[qik.pygraph.core.Module, qik.pygraph.core.Module]] = set().union(
-        *(graph.upstream_imports(imp) for imp in fence_pyimports)
-    )
-
-    def _fmt_violation(imp: str) -> str:
-        """Create a human readable violation message."""
-        src, dest = imp.split(":")
-        return f"{src} imports {dest}"
-
-    internal_imps = "\n".join(f"{src.imp}:{dest.imp}" for src, dest in imps if dest.is_internal)
-    internal_fence_re = _generate_fence_regex(fence_pyimports)
-    internal_violations = [
-        _fmt_violation(violation.group())
-        for violation in re.finditer(internal_fence_re, internal_imps)
-    ]
-
-    external_imps = "\n".join(
-        f"{src.imp}:{dest.imp}" for src, dest in imps if not dest.is_internal
-    )
-    external_fence_re = _generate_fence_regex(
-        (*fence_pyimports, *runnable.resolved_venv.packages_distributions())
+    imps = graph.upstream_imports_union(fence_pyimports)
+    if not imps:
+        return 0, f'No import violations found across 0 imports in "{runnable.space}" space'
+
+    internal_trie = _fence_trie(frozenset(fence_pyimports))
+    # Only load the venv's distributions when there are external imports to check
+    external_trie = (
+        _fence_trie(
+            frozenset((*fence_pyimports, *runnable.resolved_venv.packages_distributions()))
+        )
+        if any(not dest.is_internal for _, dest in imps)
+        else internal_trie
     )
-    external_violations = [
-        _fmt_violation(violation.group())
-        for violation in re.finditer(external_fence_re, external_imps)
-    ]
+    internal_violations: list[str] = []
+    external_violations: list[str] = []
+    for src, dest in imps:
+        trie, violations = (
+            (internal_trie, internal_violations)
+            if dest.is_internal
+            else (external_trie, external_violations)
+        )
+        if trie.has_prefix(src.imp) and not trie.has_prefix(dest.imp):
+            violations.append(f"{src.imp} imports {dest.imp}")
 
     ret_code = 0 if not internal_violations and not external_violations else 1
     if ret_code == 1:
@@ -232,9 +234,13 @@ def check_cmd_factory(
     return {runnable.name: runnable for runnable in runnables}
 
 
+@qik.func.cache
+def _graph_decoder() -> msgspec.json.Decoder[qik.pygraph.core.Graph]:
+    """A reusable decoder for the serialized import graph."""
+    return msgspec.json.Decoder(qik.pygraph.core.Graph)
+
+
 @qik.func.per_run_cache
 def load_graph() -> qik.pygraph.core.Graph:
     """Load the graph."""
-    return msgspec.json.decode(
-        qik.pygraph.utils.graph_path(rel=False).read_bytes(), type=qik.pygraph.core.Graph
-    )
+    return _graph_decoder().decode(qik.pygraph.utils.graph_path(rel=False).read_bytes())
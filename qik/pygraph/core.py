@@ -2,11 +2,12 @@
 
 from __future__ import annotations
 
+import collections
 import importlib.machinery
 import importlib.util
 import pkgutil
 import sys
-from typing import TYPE_CHECKING, Iterator, Literal, overload
+from typing import TYPE_CHECKING, Iterable, Iterator, Literal, overload
 
 import msgspec
 from typing_extensions import Self
@@ -37,18 +38,46 @@ class Module(msgspec.Struct, array_like=True, omit_defaults=True, frozen=True, d
         return self.imp.replace(".", "/")
 
 
+class PrefixTrie:
+    """A trie of dotted import paths for checking if an import falls under any of them."""
+
+    def __init__(self, imps: Iterable[str]):
+        self._root: dict = {}
+        for imp in imps:
+            node = self._root
+            for part in imp.split("."):
+                node = node.setdefault(part, {})
+
+            # A None key marks the end of an import path
+            node[None] = True
+
+    def has_prefix(self, imp: str) -> bool:
+        """Return True if the import or one of its parent packages is in the trie."""
+        node = self._root
+        for part in imp.split("."):
+            node = node.get(part)
+            if node is None:
+                return False
+            elif None in node:
+                return True
+
+        return False
+
+
 class Graph(msgspec.Struct, frozen=True, dict=True):
     modules: list[Module]
     edges: list[tuple[int, int]]
 
-    def bind(self, rx_graph: rx.PyDiGraph) -> Self:
+    def bind(self, rx_graph: rx.PyDiGraph, modules_idx: dict[str, int]) -> Self:
         self.__dict__["_rx"] = rx_graph
+        self.__dict__["modules_idx"] = modules_idx
         return self
 
     @property
     def rx(self) -> rx.PyDiGraph:
         if "_rx" not in self.__dict__:
-            g = rx.PyDiGraph()
+            # Pre-size the graph so nodes and edges are inserted without reallocating
+            g = rx.PyDiGraph(node_count_hint=len(self.modules), edge_count_hint=len(self.edges))
             g.add_nodes_from(self.modules)
             g.add_edges_from_no_data(self.edges)
             self.__dict__["_rx"] = g
@@ -78,6 +107,12 @@ class Graph(msgspec.Struct, frozen=True, dict=True):
     def upstream_imports(
         self, imp: str, /, *, idx: bool = False
     ) -> list[tuple[Module, Module]] | list[tuple[int, int]]:
+        """Return the edges of a depth-first traversal from an import.
+
+        Only the edge that first reaches each module is returned, which is
+        enough to find every upstream module. Use `upstream_imports_union`
+        for every import between reachable modules.
+        """
         upstream = rx.digraph_dfs_edges(self.rx, self.modules_idx[imp])
         if idx:
             return list(upstream)
@@ -85,6 +120,27 @@ class Graph(msgspec.Struct, frozen=True, dict=True):
             modules = self.modules
             return [(modules[edge[0]], modules[edge[1]]) for edge in upstream]
 
+    def upstream_imports_union(self, imps: Iterable[str], /) -> set[tuple[Module, Module]]:
+        """Return every import reachable from any of the given imports.
+
+        The graph is traversed once from all sources so that shared upstream
+        modules are only visited a single time.
+        """
+        rx_g = self.rx
+        modules = self.modules
+        queue = collections.deque({self.modules_idx[imp] for imp in imps})
+        visited = set(queue)
+        upstream: set[tuple[Module, Module]] = set()
+        while queue:
+            node = queue.popleft()
+            for succ in rx_g.successor_indices(node):
+                upstream.add((modules[node], modules[succ]))
+                if succ not in visited:
+                    visited.add(succ)
+                    queue.append(succ)
+
+        return upstream
+
     @overload
     def upstream_modules(self, imp: str, /, *, idx: Literal[True]) -> set[int]: ...
 
@@ -116,13 +172,13 @@ def build() -> Graph:
         exclude_type_checking_imports=pygraph_conf.ignore_type_checking,
         cache_dir=str(qik.conf.priv_work_dir() / ".grimp"),
     )
-    graph_modules_imps = [(imp.split(".", 1)[0], imp) for imp in sorted(grimp_g.modules)]
-    modules = [
-        Module(imp=imp, is_internal=module in internal_modules)
-        for module, imp in graph_modules_imps
-        if module not in stdlib_modules
-    ]
-    modules_idx = {module.imp: i for i, module in enumerate(modules)}
+    modules: list[Module] = []
+    modules_idx: dict[str, int] = {}
+    for imp in sorted(grimp_g.modules):
+        top_level = imp.split(".", 1)[0]
+        if top_level not in stdlib_modules:
+            modules_idx[imp] = len(modules)
+            modules.append(Module(imp=imp, is_internal=top_level in internal_modules))
 
     # Start constructing the rustworkx graph
     rx_g = rx.PyDiGraph()
@@ -130,26 +186,26 @@ def build() -> Graph:
 
     # Add layered modules as dependencies on one another for graph locking
     def _iter_layered_module_edges() -> Iterator[tuple[int, int]]:
+        # Modules are sorted, so the ancestors of a module are always on the stack
+        # of previously-seen modules. The top of the stack is its nearest ancestor.
+        stack: list[tuple[str, int]] = []
         for i, module in enumerate(modules):
-            if i > 0 and "." in module.imp:
-                for parent in modules[i - 1 :: -1]:
-                    if found := module.imp.startswith(f"{parent.imp}."):
-                        yield (modules_idx[parent.imp], i)
+            while stack and not module.imp.startswith(f"{stack[-1][0]}."):
+                stack.pop()
 
-                    if found or "." not in parent.imp:
-                        break
+            if stack:
+                yield (stack[-1][1], i)
 
-    rx_g.add_edges_from_no_data(list(_iter_layered_module_edges()))
+            stack.append((module.imp, i))
 
     # Add edges for imports
-    for module in modules:
-        module_idx = modules_idx[module.imp]
-        rx_g.add_edges_from_no_data(
-            [
-                (module_idx, modules_idx[imported])
-                for imported in grimp_g.find_modules_directly_imported_by(module.imp)
-                if imported in modules_idx
-            ]
-        )
-
-    return Graph(modules=modules, edges=sorted(rx_g.edge_list())).bind(rx_g)
+    def _iter_import_edges() -> Iterator[tuple[int, int]]:
+        for i, module in enumerate(modules):
+            for imported in grimp_g.find_modules_directly_imported_by(module.imp):
+                if imported in modules_idx:
+                    yield (i, modules_idx[imported])
+
+    # Insert all edges with a single call to rustworkx
+    rx_g.add_edges_from_no_data([*_iter_layered_module_edges(), *_iter_import_edges()])
+
+    return Graph(modules=modules, edges=sorted(rx_g.edge_list())).bind(rx_g, modules_idx)
@@ -18,38 +18,25 @@ class PygraphPluginConf(qik.conf.PluginConf, frozen=True, dict=True, tag="qik.py
     lock_cache: str | qik.unset.UnsetType = qik.unset.UNSET
     check_cache: str | qik.unset.UnsetType = qik.unset.UNSET
 
-    @qik.func.cached_property
-    def resolved_build_cache(self) -> str:
+    def _resolve_cache(self, cache: str | qik.unset.UnsetType) -> str:
+        """Resolve a command-specific cache, falling back to the plugin and project defaults."""
         return qik.ctx.format(
             qik.unset.coalesce(
-                self.build_cache,
-                self.cache,
-                qik.conf.project().defaults.cache,
-                default="local",
+                cache, self.cache, qik.conf.project().defaults.cache, default="local"
             )
         )
 
+    @qik.func.cached_property
+    def resolved_build_cache(self) -> str:
+        return self._resolve_cache(self.build_cache)
+
     @qik.func.cached_property
     def resolved_lock_cache(self) -> str:
-        return qik.ctx.format(
-            qik.unset.coalesce(
-                self.lock_cache,
-                self.cache,
-                qik.conf.project().defaults.cache,
-                default="local",
-            )
-        )
+        return self._resolve_cache(self.lock_cache)
 
     @qik.func.cached_property
     def resolved_check_cache(self) -> str:
-        return qik.ctx.format(
-            qik.unset.coalesce(
-                self.check_cache,
-                self.cache,
-                qik.conf.project().defaults.cache,
-                default="local",
-            )
-        )
+        return self._resolve_cache(self.check_cache)
 
 
 qik.conf.register_type(PygraphDepConf, "qik.pygraph.dep.factory")
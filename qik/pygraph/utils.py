@@ -36,7 +36,7 @@ def graph_path(rel: bool = True) -> pathlib.Path:
         if pygraph_conf.resolved_build_cache == "repo"
         else qik.conf.priv_work_dir(rel=rel)
     )
-    return root / "artifacts" / build_cmd_name() / "graph.json"
+    return root.joinpath("artifacts", build_cmd_name(), "graph.json")
 
 
 @qik.func.cache
@@ -48,4 +48,4 @@ def lock_path(pyimport: str, space: str | None = None, rel: bool = True) -> path
         else qik.conf.priv_work_dir(rel=rel)
     )
     file_name = f"lock.{pyimport}.{space}.json" if space else f"lock.{pyimport}.json"
-    return root / "artifacts" / lock_cmd_name() / file_name
+    return root.joinpath("artifacts", lock_cmd_name(), file_name)
@@ -3,12 +3,11 @@ from __future__ import annotations
 import fnmatch
 import pkgutil
 import re
-from typing import TYPE_CHECKING, Literal, TypeAlias
+from typing import TYPE_CHECKING, Callable, Literal, TypeAlias
 
 import msgspec
 from typing_extensions import Self
 
-import qik.cache
 import qik.conf
 import qik.ctx
 import qik.dep
@@ -28,9 +27,14 @@ if TYPE_CHECKING:
 
     import pathlib
 
-    import qik.cache
+    import qik.cache as qik_cache
     import qik.logger
     import qik.venv
+else:
+    import qik.lazy
+
+    # Cache backends are only needed once runnables execute
+    qik_cache = qik.lazy.module("qik.cache")
 
 
 class DepsCollection:
@@ -45,11 +49,11 @@ class DepsCollection:
         self.space_globs = runnable.resolved_space.glob_deps if runnable.resolved_space else set()
         self.venv = runnable.resolved_venv
 
-    @property
-    def globs(self) -> set[str]:
+    @qik.func.cached_property
+    def _static_globs(self) -> set[str]:
+        """Globs that don't depend on the contents of loaded dependency files."""
         return (
-            {glob for dep in self._deps for glob in dep.globs}
-            | {
+            {
                 artifact
                 for runnable in self.runnables.values()
                 for artifact in runnable.obj.artifacts
@@ -58,6 +62,11 @@ class DepsCollection:
             | self.space_globs
         )
 
+    @property
+    def globs(self) -> set[str]:
+        # Loaded dependencies can change during a run, so dependency globs are always re-read
+        return {glob for dep in self._deps for glob in dep.globs} | self._static_globs
+
     @qik.func.cached_property
     def consts(self) -> set[str]:
         return {
@@ -81,7 +90,7 @@ class DepsCollection:
     def pydists(self) -> set[str]:
         return {pydist for dep in self._deps for pydist in dep.pydists}
 
-    @property
+    @qik.func.cached_property
     def runnables(self) -> dict[str, qik.dep.Runnable]:
         return {
             runnable.name: runnable
@@ -137,11 +146,11 @@ def _make_runnable(
     cmd: str,
     conf: qik.conf.Cmd,
     space: str | None,
+    artifacts: list[str],
+    cache: str,
+    cache_when: qik.conf.CacheWhen,
     module: qik.conf.ModuleLocator | None = None,
 ) -> Runnable:
-    # If the command has no deps, use "none" as the cache unless explicitly set
-    initial_cache = "none" if not conf.deps else conf.cache
-
     return Runnable(
         name=fmt_name(cmd, module=module, space=space),
         cmd=cmd,
@@ -151,15 +160,9 @@ def _make_runnable(
             *(qik.dep.factory(dep, module=module, space=space) for dep in conf.deps),
         ],
         module=module.name if module else None,
-        artifacts=[qik.ctx.format(artifact) for artifact in conf.artifacts],
-        cache=qik.ctx.format(
-            qik.unset.coalesce(initial_cache, qik.conf.project().defaults.cache, default="local")
-        ),
-        cache_when=qik.ctx.format(
-            qik.unset.coalesce(
-                conf.cache_when, qik.conf.project().defaults.cache_when, default="success"
-            )
-        ),  # type: ignore
+        artifacts=artifacts,
+        cache=cache,
+        cache_when=cache_when,
         space=space,
     )
 
@@ -170,41 +173,88 @@ def factory(cmd: str, conf: qik.conf.Cmd, **args: str) -> dict[str, Runnable]:
     We don't preserve **args in the made runnables because generic runnables do not
     yet support args. Only custom runnables do.
     """
+    proj = qik.conf.project()
+
+    # Artifacts and caching don't vary by module, so resolve them once for all runnables.
+    # If the command has no deps, use "none" as the cache unless explicitly set
+    initial_cache = "none" if not conf.deps else conf.cache
+    artifacts = [qik.ctx.format(artifact) for artifact in conf.artifacts]
+    cache = qik.ctx.format(qik.unset.coalesce(initial_cache, proj.defaults.cache, default="local"))
+    cache_when = qik.ctx.format(
+        qik.unset.coalesce(conf.cache_when, proj.defaults.cache_when, default="success")
+    )
+
     if "{module" in conf.exec:
-        proj = qik.conf.project()
         if not isinstance(conf.space, qik.unset.UnsetType):
             spaces = {conf.space: qik.space.load(conf.space).conf}
         else:
             spaces = proj.resolved_spaces
 
         runnables = (
-            _make_runnable(cmd=cmd, conf=conf, module=module, space=space)
+            _make_runnable(
+                cmd=cmd,
+                conf=conf,
+                module=module,
+                space=space,
+                artifacts=artifacts,
+                cache=cache,
+                cache_when=cache_when,  # type: ignore
+            )
             for space, space_conf in spaces.items()
             for module in space_conf.modules_by_name.values()
         )
     else:
         space = conf.space if not isinstance(conf.space, qik.unset.UnsetType) else "default"
-        runnables = [_make_runnable(cmd=cmd, conf=conf, space=space)]
+        runnables = [
+            _make_runnable(
+                cmd=cmd,
+                conf=conf,
+                space=space,
+                artifacts=artifacts,
+                cache=cache,
+                cache_when=cache_when,  # type: ignore
+            )
+        ]
 
     return {runnable.name: runnable for runnable in runnables}
 
 
-class Result(msgspec.Struct, frozen=True):
+class Result(msgspec.Struct, frozen=True, gc=False):
     log: str | None
     code: int
     hash: str
 
     @classmethod
-    def from_cache(cls, entry: qik.cache.Entry) -> Self:
+    def from_cache(cls, entry: qik_cache.Entry) -> Self:
         return cls(log=entry.log, code=entry.manifest.code, hash=entry.manifest.hash)
 
 
 @qik.func.cache
 def _glob_to_regex(glob_pattern: str) -> str:
     """Translate a glob to a regex pattern"""
+    if not any(char in glob_pattern for char in "*?["):
+        # Literal paths, such as lock files and artifacts, don't need fnmatch's translation
+        return f"(^{re.escape(glob_pattern)})$"
+
     return fnmatch.translate(glob_pattern).replace("?s:", "^").replace(r"\Z", "$")
 
 
+@qik.func.cache
+def _files_regex(globs: frozenset[str]) -> re.Pattern | None:
+    """Compile a regex matching any of the globs.
+
+    Runnables often share the same globs, so they share the compiled regex.
+    """
+    files_regex = ")|(".join(_glob_to_regex(glob) for glob in sorted(globs))
+    return re.compile(f"({files_regex})", re.M) if files_regex else None
+
+
+@qik.func.cache
+def _resolve_func(val: str) -> Callable[..., tuple[int, str]]:
+    """Resolve the python function of a non-shell runnable."""
+    return pkgutil.resolve_name(val)
+
+
 class Runnable(msgspec.Struct, frozen=True, dict=True):
     name: str
     cmd: str
@@ -251,24 +301,27 @@ class Runnable(msgspec.Struct, frozen=True, dict=True):
         )
         return {**base_environ, **self.environ}
 
-    @property
-    def _exec_env(self) -> dict[str, str]:
-        """Get the environment for runnables."""
+    @qik.func.cached_property
+    def _base_exec_env(self) -> dict[str, str]:
+        """The parts of the runnable environment that don't change between executions."""
         return {
             **self.resolved_environ,
             "QIK__CMD": self.cmd,
             "QIK__RUNNABLE": self.name,
-            "QIK__WORKER": str(qik.ctx.worker_id()),
         }
 
+    @property
+    def _exec_env(self) -> dict[str, str]:
+        """Get the environment for runnables."""
+        return {**self._base_exec_env, "QIK__WORKER": str(qik.ctx.worker_id())}
+
     def filter_regex(self, strategy: FilterStrategy) -> re.Pattern | None:
         """Generate the regex used for file-based filtering.
 
         File-based filtering occurs during --since and --watch.
         """
         globs = self.deps_collection.since if strategy == "since" else self.deps_collection.watch
-        files_regex = ")|(".join(_glob_to_regex(glob) for glob in globs)
-        return re.compile(f"({files_regex})", re.M) if files_regex else None
+        return _files_regex(frozenset(globs))
 
     @qik.func.cached_property
     def spec_hash(self) -> str:
@@ -294,10 +347,10 @@ class Runnable(msgspec.Struct, frozen=True, dict=True):
             case other:
                 raise AssertionError(f'Unexpected cache_when "{other}".')
 
-    def get_cache_backend(self) -> qik.cache.Cache:
-        return qik.cache.load(self.cache)
+    def get_cache_backend(self) -> qik_cache.Cache:
+        return qik_cache.load(self.cache)
 
-    def get_cache_entry(self, artifacts: bool = True) -> qik.cache.Entry | None:
+    def get_cache_entry(self, artifacts: bool = True) -> qik_cache.Entry | None:
         if not qik.ctx.by_namespace("qik").force:
             entry = self.get_cache_backend().get(self, artifacts=artifacts)
             if entry and self.should_cache(entry.manifest.code):
@@ -345,7 +398,7 @@ class Runnable(msgspec.Struct, frozen=True, dict=True):
                 code = process.returncode
                 log = "".join(output)
             else:
-                code, log = pkgutil.resolve_name(self.val)(runnable=self)
+                code, log = _resolve_func(self.val)(runnable=self)
                 logger.print(log, runnable=self, event="output")
         except qik.errors.RunnableError as exc:
             log = qik.errors.fmt_msg(exc)
@@ -358,11 +411,12 @@ class Runnable(msgspec.Struct, frozen=True, dict=True):
         """Run a command, caching the results."""
         logger = qik.ctx.runner().logger
         print_kwargs = {"runnable": self}
+        msg = f"{self.name} [default][dim]{self.description}"
 
         def _log_start(cached: bool) -> None:
             if cached:
                 logger.print(
-                    msg=f"{self.name} [default][dim]{self.description}",
+                    msg=msg,
                     emoji="fast-forward_button",
                     color="cyan",
                     event="start",
@@ -370,7 +424,7 @@ class Runnable(msgspec.Struct, frozen=True, dict=True):
                 )
             else:
                 logger.print(
-                    msg=f"{self.name} [default][dim]{self.description}",
+                    msg=msg,
                     emoji="construction",
                     color="cyan",
                     event="start",
@@ -400,7 +454,7 @@ class Runnable(msgspec.Struct, frozen=True, dict=True):
 
         if result.code == 0:
             logger.print(
-                msg=f"{self.name} [default][dim]{self.description}",
+                msg=msg,
                 emoji="white_check_mark",
                 color="green",
                 event="finish",
@@ -409,7 +463,7 @@ class Runnable(msgspec.Struct, frozen=True, dict=True):
             )
         else:
             logger.print(
-                msg=f"{self.name} [default][dim]{self.description}",
+                msg=msg,
                 emoji="broken_heart",
                 color="red",
                 event="finish",
@@ -4,6 +4,7 @@ import collections
 import concurrent.futures
 import copy
 import pathlib
+import queue
 import sys
 from typing import TYPE_CHECKING, Iterable, Iterator, Literal, TypeAlias
 
@@ -23,13 +24,18 @@ import qik.unset
 import qik.watcher
 
 if TYPE_CHECKING:
-    from qik.cache import Entry
     from qik.runnable import Result, Runnable
 
     Direction: TypeAlias = Literal["up", "down"]
     Edges: TypeAlias = dict[str, set[str]]
 
 
+@qik.func.cache
+def _pool(workers: int) -> concurrent.futures.ThreadPoolExecutor:
+    """The thread pool shared by graph filtering and runners."""
+    return concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+
+
 class DAGPool:
     def __init__(self, graph: Graph):
         self.graph = graph
@@ -49,6 +55,9 @@ class DAGPool:
         results: dict[str, Result | None] = {}
         failed: set[str] = set()
         futures: dict[str, concurrent.futures.Future] = {}
+        future_names: dict[concurrent.futures.Future, str] = {}
+        # Futures put themselves here when done so that we don't wait on all pending futures
+        done: queue.SimpleQueue[concurrent.futures.Future] = queue.SimpleQueue()
         exception: Exception | None = None
 
         def _skip(name: str):
@@ -67,7 +76,7 @@ class DAGPool:
             )
 
         def _finish(future: concurrent.futures.Future) -> Exception | None:
-            name = next(name for name, val in futures.items() if val == future)
+            name = future_names.pop(future)
             exception: Exception | None = None
             try:
                 result = future.result()
@@ -95,16 +104,21 @@ class DAGPool:
             for name in ready_tasks:
                 if name not in futures:
                     if not any(dep in failed for dep in self.upstream[name]):
-                        futures[name] = self.pool.submit(self.nodes[name].exec)
+                        future = self.pool.submit(self.nodes[name].exec)
+                        futures[name] = future
+                        future_names[future] = name
+                        future.add_done_callback(done.put)
                     else:
                         _skip(name)
 
-            finished, unfinished = concurrent.futures.wait(
-                futures.values(), return_when=concurrent.futures.FIRST_COMPLETED
-            )
-            if not finished and not unfinished:
+            if not futures:
                 break
 
+            # Block for one future, then collect any others that finished in the meantime
+            finished = [done.get()]
+            while not done.empty():
+                finished.append(done.get())
+
             for future in finished:
                 exception = _finish(future) or exception
 
@@ -155,24 +169,47 @@ class Graph:
             "down": collections.defaultdict(set[str]),
         }
 
-        def _runnable_edges(runnable: Runnable) -> Iterator[tuple[Runnable, Runnable, Direction]]:
-            """Given a runnable, iterate over all of its edges."""
+        default_isolated = qik.ctx.by_namespace("qik").isolated
+
+        def _runnable_deps(runnable: Runnable) -> Iterator[qik.dep.Runnable]:
+            """Given a runnable, iterate over the dependent runnables included in the graph."""
             for dep in runnable.deps_collection.runnables.values():
                 isolated = (
                     dep.isolated
                     if not isinstance(dep.isolated, qik.unset.UnsetType)
-                    else qik.ctx.by_namespace("qik").isolated
+                    else default_isolated
                 )
                 if not isolated or dep.obj.name in self._nodes:
-                    yield (runnable, dep.obj, "up")
-                    if dep.strict:
-                        yield (dep.obj, runnable, "down")
-
-                    yield from _runnable_edges(dep.obj)
+                    yield dep
 
         def _runnables_edges() -> Iterator[tuple[Runnable, Runnable, Direction]]:
+            """Iterate over all edges depth-first, expanding each runnable once."""
+            visited: set[str] = set()
             for runnable in self._nodes.values():
-                yield from _runnable_edges(runnable)
+                if runnable.name in visited:
+                    continue
+
+                visited.add(runnable.name)
+                # Runnables on the current path are tracked to detect cycles
+                path = {runnable.name}
+                stack = [(runnable, _runnable_deps(runnable))]
+                while stack:
+                    src, deps = stack[-1]
+                    if (dep := next(deps, None)) is None:
+                        stack.pop()
+                        path.remove(src.name)
+                        continue
+
+                    yield (src, dep.obj, "up")
+                    if dep.strict:
+                        yield (dep.obj, src, "down")
+
+                    if dep.obj.name in path:
+                        raise qik.errors.GraphCycle("Cycle detected in DAG.")
+                    elif dep.obj.name not in visited:
+                        visited.add(dep.obj.name)
+                        path.add(dep.obj.name)
+                        stack.append((dep.obj, _runnable_deps(dep.obj)))
 
         edges = list(_runnables_edges())
         for src, dest, direction in edges:
@@ -181,12 +218,17 @@ class Graph:
             self._nodes[dest.name] = dest
 
     def _dfs(self, start_node: str, direction: Direction) -> set[str]:
-        def _dfs_trav(node: str) -> Iterator[str]:
-            for name in self._graph[direction][node]:
-                yield name
-                yield from _dfs_trav(name)
-
-        return set(_dfs_trav(start_node))
+        # Traverse with a stack so that shared descendants are only visited once
+        edges = self._graph[direction]
+        visited: set[str] = set()
+        stack = [start_node]
+        while stack:
+            for name in edges[stack.pop()]:
+                if name not in visited:
+                    visited.add(name)
+                    stack.append(name)
+
+        return visited
 
     @qik.func.cached_property
     def _upstream(self) -> Edges:
@@ -211,18 +253,20 @@ class Graph:
     def filter_cache_status(self, cache_status: qik.conf.CacheStatus) -> Self:
         """Filter the graph by cache status."""
 
-        def _matches_cache_status(entry: Entry | None) -> bool:
+        def _matches_cache_status(runnable: Runnable) -> bool:
+            if runnable.get_cache_backend().type == "none":
+                return False
+
+            entry = runnable.get_cache_entry(artifacts=False)
             return bool(entry) if cache_status == "warm" else not bool(entry)
 
+        # Cache lookups hash each runnable and may query remote caches, so run them in parallel
+        runnables = list(self)
+        pool = _pool(qik.ctx.by_namespace("qik").workers)
+        matches = list(pool.map(_matches_cache_status, runnables))
+
         return self.filter(
-            (
-                runnable
-                for runnable in self
-                if (
-                    runnable.get_cache_backend().type != "none"
-                    and _matches_cache_status(runnable.get_cache_entry(artifacts=False))
-                )
-            ),
+            (runnable for runnable, match in zip(runnables, matches, strict=True) if match),
             neighbors=False,
         )
 
@@ -312,9 +356,7 @@ class Graph:
 class Runner:
     def __init__(self, graph: Graph) -> None:
         self.graph = graph
-        self.pool = concurrent.futures.ThreadPoolExecutor(
-            max_workers=qik.ctx.by_namespace("qik").workers
-        )
+        self.pool = _pool(qik.ctx.by_namespace("qik").workers)
         qik_ctx = qik.ctx.by_namespace("qik")
         self.logger = (
             qik.logger.Stdout()
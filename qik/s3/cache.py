@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-import concurrent.futures
 import os
 import pathlib
+import tarfile
+import tempfile
 from typing import TYPE_CHECKING
 
 import boto3.s3
@@ -15,6 +16,9 @@ import qik.func
 
 if TYPE_CHECKING:
     import boto3
+    import boto3.s3.transfer as boto3_transfer
+    import botocore.config as botocore_config
+    import botocore.exceptions as botocore_exceptions
     from boto3.resources.base import ServiceResource
 
     from qik.runnable import Runnable
@@ -23,28 +27,13 @@ else:
     import qik.lazy
 
     boto3 = qik.lazy.module("boto3")
+    boto3_transfer = qik.lazy.module("boto3.s3.transfer")
+    botocore_config = qik.lazy.module("botocore.config")
+    botocore_exceptions = qik.lazy.module("botocore.exceptions")
 
 
-def _download_file(*, bucket, obj, dir: pathlib.Path, prefix: pathlib.Path):
-    target = dir / os.path.relpath(obj.key, str(prefix))
-
-    if obj.key[-1] == "/":
-        return  # Skip directories
-
-    try:
-        bucket.download_file(obj.key, target)
-    except FileNotFoundError:
-        qik.file.make_parent_dirs(target)
-        bucket.download_file(obj.key, target)
-
-    return obj.key
-
-
-def _upload_file(*, bucket, prefix: pathlib.Path, path: pathlib.Path, dir: pathlib.Path) -> str:
-    relative_path = os.path.relpath(path, dir)
-    s3_key = str((prefix / relative_path)).replace("\\", "/")
-    bucket.upload_file(path, s3_key)
-    return s3_key
+# The number of threads each runnable uses to transfer files
+_TRANSFER_WORKERS = 10
 
 
 class Client(msgspec.Struct, frozen=True, dict=True):
@@ -57,49 +46,139 @@ class Client(msgspec.Struct, frozen=True, dict=True):
     @qik.func.cached_property
     def s3_session(self) -> ServiceResource:
         s3_kwargs = {"endpoint_url": self.endpoint_url} if self.endpoint_url else {}
+        # Runnables share the client and each transfers files with its own threads. Size
+        # the connection pool for every worker so that connections are reused, not discarded.
+        config = botocore_config.Config(
+            max_pool_connections=qik.ctx.by_namespace("qik").workers * _TRANSFER_WORKERS
+        )
         return boto3.Session(  # type: ignore
             aws_access_key_id=self.aws_access_key_id,
             aws_secret_access_key=self.aws_secret_access_key,
             aws_session_token=self.aws_session_token,
             region_name=self.region_name,
-        ).resource("s3", **s3_kwargs)  # type: ignore
+        ).resource("s3", config=config, **s3_kwargs)  # type: ignore
+
+    def _transfer_manager(self, max_workers: int) -> boto3_transfer.TransferManager:
+        """A transfer manager that shares its threads across all files of a transfer."""
+        return boto3_transfer.TransferManager(
+            self.s3_session.meta.client,  # type: ignore
+            boto3_transfer.TransferConfig(max_concurrency=max_workers),
+        )
 
     def download_dir(
-        self, *, bucket_name: str, prefix: pathlib.Path, dir: pathlib.Path, max_workers: int = 10
+        self,
+        *,
+        bucket_name: str,
+        prefix: pathlib.Path,
+        dir: pathlib.Path,
+        max_workers: int = _TRANSFER_WORKERS,
     ) -> None:
         bucket = self.s3_session.Bucket(bucket_name)  # type: ignore
+        dir_str = os.fspath(dir)
+        prefix_key = f"{prefix}/".replace("\\", "/")
+        parent_dirs: set[str] = set()
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = [
-                executor.submit(_download_file, bucket=bucket, obj=obj, dir=dir, prefix=prefix)
-                for obj in bucket.objects.filter(Prefix=str(prefix))
-            ]
+        with self._transfer_manager(max_workers) as manager:
+            futures = []
+            for obj in bucket.objects.filter(Prefix=prefix_key):
+                if obj.key[-1] == "/":
+                    continue  # Skip directories
 
-            for future in concurrent.futures.as_completed(futures):
-                # TODO: Better handle partial upload failures
+                target = os.path.join(dir_str, obj.key[len(prefix_key) :])
+                if (parent_dir := os.path.dirname(target)) not in parent_dirs:
+                    qik.file.make_parent_dirs(pathlib.Path(target))
+                    parent_dirs.add(parent_dir)
+
+                futures.append(manager.download(bucket_name, obj.key, target))
+
+            for future in futures:
+                # TODO: Better handle partial download failures
                 future.result()
 
     def upload_dir(
-        self, *, bucket_name: str, prefix: pathlib.Path, dir: pathlib.Path, max_workers: int = 10
+        self,
+        *,
+        bucket_name: str,
+        prefix: pathlib.Path,
+        dir: pathlib.Path,
+        files: list[str],
+        max_workers: int = _TRANSFER_WORKERS,
     ) -> None:
-        bucket = self.s3_session.Bucket(bucket_name)  # type: ignore
+        """Upload files relative to a directory."""
+        dir_str = os.fspath(dir)
+        prefix_key = f"{prefix}/".replace("\\", "/")
+        with self._transfer_manager(max_workers) as manager:
+            futures = []
+            for file in files:
+                s3_key = prefix_key + file.replace("\\", "/")
+                futures.append(manager.upload(os.path.join(dir_str, file), bucket_name, s3_key))
+
+            for future in futures:
+                # TODO: Better handle partial upload failures
+                future.result()
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = [
-                executor.submit(
-                    _upload_file,
-                    prefix=prefix,
-                    bucket=bucket,
-                    path=pathlib.Path(root) / file,
-                    dir=dir,
+    def download_tar(self, *, bucket_name: str, key: str, dir: pathlib.Path) -> None:
+        """Download a gzipped tarball and extract it into a directory."""
+        with tempfile.TemporaryFile() as file:
+            try:
+                self.s3_session.meta.client.download_fileobj(  # type: ignore
+                    bucket_name,
+                    key,
+                    file,
+                    Config=boto3_transfer.TransferConfig(max_concurrency=_TRANSFER_WORKERS),
                 )
-                for root, _, files in os.walk(dir)
-                for file in files
-            ]
+            except botocore_exceptions.ClientError as exc:
+                # Without s3:ListBucket permission, S3 returns a 403 instead of a 404 for
+                # missing keys. Bundles only need object permissions, so treat both as a miss
+                if exc.response["Error"]["Code"] in ("403", "404", "NoSuchKey"):
+                    return
+
+                raise
+
+            file.seek(0)
+            with tarfile.open(fileobj=file, mode="r:gz") as tar:
+                # Use the safe "data" extraction filter where python supports it
+                if hasattr(tarfile, "data_filter"):
+                    tar.extractall(dir, filter="data")
+                else:  # pragma: no cover
+                    tar.extractall(dir, members=_checked_members(tar))
+
+    def upload_tar(
+        self, *, bucket_name: str, key: str, dir: pathlib.Path, files: list[str]
+    ) -> None:
+        """Upload files relative to a directory as a gzipped tarball."""
+        with tempfile.TemporaryFile() as file:
+            with tarfile.open(fileobj=file, mode="w:gz", compresslevel=1) as tar:
+                for name in files:
+                    tar.add(dir / name, arcname=name)
+
+            file.seek(0)
+            self.s3_session.meta.client.upload_fileobj(  # type: ignore
+                file,
+                bucket_name,
+                key,
+                Config=boto3_transfer.TransferConfig(max_concurrency=_TRANSFER_WORKERS),
+            )
+
+
+def _checked_members(tar: tarfile.TarFile) -> list[tarfile.TarInfo]:
+    """Return the members of a tarball, ensuring they stay inside the extraction directory."""
+    members = tar.getmembers()
+    for member in members:
+        if (
+            os.path.isabs(member.name)
+            or ".." in pathlib.PurePath(member.name).parts
+            or member.issym()
+            or member.islnk()
+        ):
+            raise tarfile.TarError(f'Unsafe member "{member.name}" in cache bundle.')
+
+    return members
 
-            for future in concurrent.futures.as_completed(futures):
-                # TODO: Better handle partial upload failures
-                future.result()
+
+def _bundle_key(remote_path: pathlib.Path) -> str:
+    """The key of a cache entry that is stored as a single tarball."""
+    return f"{remote_path}.tar.gz".replace("\\", "/")
 
 
 class S3Cache(msgspec.Struct, qik.cache.Local, frozen=True, dict=True):
@@ -112,6 +191,7 @@ class S3Cache(msgspec.Struct, qik.cache.Local, frozen=True, dict=True):
     aws_session_token: str | None = None
     region_name: str | None = None
     endpoint_url: str | None = None
+    bundle: bool = False
 
     def remote_path(self, *, runnable: Runnable, hash: str) -> pathlib.Path:
         return pathlib.Path(self.prefix) / f"{runnable.slug}-{hash}"
@@ -126,23 +206,55 @@ class S3Cache(msgspec.Struct, qik.cache.Local, frozen=True, dict=True):
             endpoint_url=self.endpoint_url,
         )
 
+    def _entry_files(self, *, runnable: Runnable, manifest: qik.cache.Manifest) -> list[str]:
+        """The files of a cache entry, relative to the base path.
+
+        Runnables of the same command share a base path, so only the files
+        of the entry are uploaded rather than the entire directory.
+        """
+        files = [self.manifest_path(runnable=runnable, hash=manifest.hash).name]
+        if manifest.log:
+            files.append(manifest.log)
+
+        files.extend(qik.cache._artifact_name(artifact) for artifact in set(manifest.artifacts))
+        return files
+
     def on_miss(self, *, runnable: Runnable, hash: str) -> None:
         super().pre_get(runnable=runnable, hash=hash)
 
-        self.client.download_dir(
-            bucket_name=self.bucket,
-            prefix=self.remote_path(runnable=runnable, hash=hash),
-            dir=self.base_path(runnable=runnable, hash=hash),
-        )
+        remote_path = self.remote_path(runnable=runnable, hash=hash)
+        if self.bundle:
+            self.client.download_tar(
+                bucket_name=self.bucket,
+                key=_bundle_key(remote_path),
+                dir=self.base_path(runnable=runnable, hash=hash),
+            )
+        else:
+            self.client.download_dir(
+                bucket_name=self.bucket,
+                prefix=remote_path,
+                dir=self.base_path(runnable=runnable, hash=hash),
+            )
 
     def post_set(self, *, runnable: Runnable, hash: str, manifest: qik.cache.Manifest) -> None:
         super().post_set(runnable=runnable, hash=hash, manifest=manifest)
 
-        self.client.upload_dir(
-            bucket_name=self.bucket,
-            prefix=self.remote_path(runnable=runnable, hash=hash),
-            dir=self.base_path(runnable=runnable, hash=hash),
-        )
+        remote_path = self.remote_path(runnable=runnable, hash=hash)
+        files = self._entry_files(runnable=runnable, manifest=manifest)
+        if self.bundle:
+            self.client.upload_tar(
+                bucket_name=self.bucket,
+                key=_bundle_key(remote_path),
+                dir=self.base_path(runnable=runnable, hash=hash),
+                files=files,
+            )
+        else:
+            self.client.upload_dir(
+                bucket_name=self.bucket,
+                prefix=remote_path,
+                dir=self.base_path(runnable=runnable, hash=hash),
+                files=files,
+            )
 
 
 def factory(name: str, conf: S3Conf) -> S3Cache:
@@ -156,4 +268,5 @@ def factory(name: str, conf: S3Conf) -> S3Cache:
         aws_session_token=qik.ctx.format(conf.aws_session_token),
         region_name=qik.ctx.format(conf.region_name),
         endpoint_url=endpoint_url,
+        bundle=conf.bundle,
     )
@@ -11,6 +11,7 @@ class S3Conf(qik.conf.Cache, frozen=True, tag="s3"):
     aws_session_token: str | None = None
     region_name: str | None = None
     endpoint_url: str | None = None
+    bundle: bool = False
 
 
 qik.conf.register_type(S3Conf, "qik.s3.cache.factory")
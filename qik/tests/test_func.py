@@ -0,0 +1,26 @@
+import pytest
+
+import qik.func
+
+
+def test_cached_property():
+    class Obj:
+        calls = 0
+
+        @qik.func.cached_property
+        def val(self) -> int:
+            self.calls += 1
+            return self.calls
+
+        @qik.func.cached_property
+        def missing(self) -> int:
+            raise AttributeError("missing")
+
+    obj = Obj()
+    assert obj.val == 1
+    assert obj.val == 1
+    assert isinstance(Obj.val, qik.func.cached_property)
+
+    # Attribute errors raised by the property are not masked
+    with pytest.raises(AttributeError, match="missing"):
+        _ = obj.missing
@@ -1,17 +1,24 @@
 from __future__ import annotations
 
 import contextlib
+import io
 import os
 import pathlib
 import shutil
 import subprocess
+import tarfile
 import time
 from typing import Iterator
 
 import boto3
+import botocore.exceptions
 import moto.server
+import msgspec
 import pytest
 
+import qik.cache
+import qik.s3.cache
+
 
 @pytest.fixture(scope="module", autouse=True)
 def mock_s3():
@@ -44,6 +51,18 @@ def patch_aws_creds(mocker):
     yield
 
 
+def _s3_cache(*, bundle: bool) -> qik.s3.cache.S3Cache:
+    return qik.s3.cache.S3Cache(
+        bucket="qik-cache-test",
+        prefix="unit",
+        aws_access_key_id="fake",
+        aws_secret_access_key="fake",
+        region_name="us-west-2",
+        endpoint_url="http://127.0.0.1:5000",
+        bundle=bundle,
+    )
+
+
 def shell(
     cli_invocation, cwd: str | None = "test_project", env: dict[str, str] | None = None
 ) -> subprocess.CompletedProcess:
@@ -52,6 +71,107 @@ def shell(
     )
 
 
+@pytest.mark.parametrize("bundle", [True, False])
+def test_s3_cache_round_trip(bundle, tmp_path, mocker):
+    """Upload a cache entry to S3 and download it into an empty local cache."""
+    mocker.patch("qik.conf.priv_work_dir", autospec=True, return_value=tmp_path)
+    runnable = mocker.Mock(slug=f"round_trip_{bundle}", cmd="cmd")
+    cache = _s3_cache(bundle=bundle)
+    manifest = qik.cache.Manifest(
+        name="cmd", hash="hash", code=0, log="cmd.out", artifacts=["out.txt"]
+    )
+    entry_files = {
+        f"{runnable.slug}.json": msgspec.json.encode(manifest),
+        "cmd.out": b"log",
+        qik.cache._artifact_name("out.txt"): b"artifact",
+    }
+    base_path = cache.base_path(runnable=runnable, hash="hash")
+    base_path.mkdir(parents=True)
+    for name, contents in entry_files.items():
+        (base_path / name).write_bytes(contents)
+
+    # Files of other runnables in the same command aren't uploaded
+    (base_path / "other.json").write_bytes(b"{}")
+    cache.post_set(runnable=runnable, hash="hash", manifest=manifest)
+
+    remote_path = f"unit/{runnable.slug}-hash"
+    bucket = cache.client.s3_session.Bucket("qik-cache-test")
+    remote_keys = {obj.key for obj in bucket.objects.filter(Prefix=remote_path)}
+    if bundle:
+        assert remote_keys == {f"{remote_path}.tar.gz"}
+    else:
+        assert remote_keys == {f"{remote_path}/{name}" for name in entry_files}
+
+    shutil.rmtree(tmp_path)
+    cache.on_miss(runnable=runnable, hash="hash")
+    assert {path.name: path.read_bytes() for path in base_path.iterdir()} == entry_files
+
+
+def test_s3_cache_entry_files(tmp_path, mocker):
+    """Only files of the cache entry are uploaded."""
+    mocker.patch("qik.conf.priv_work_dir", autospec=True, return_value=tmp_path)
+    runnable = mocker.Mock(slug="entry_files", cmd="cmd")
+    cache = _s3_cache(bundle=False)
+
+    manifest = qik.cache.Manifest(name="cmd", hash="hash", code=0)
+    assert cache._entry_files(runnable=runnable, manifest=manifest) == ["entry_files.json"]
+
+    manifest = qik.cache.Manifest(
+        name="cmd", hash="hash", code=0, log="cmd.out", artifacts=["out.txt", "out.txt"]
+    )
+    assert cache._entry_files(runnable=runnable, manifest=manifest) == [
+        "entry_files.json",
+        "cmd.out",
+        qik.cache._artifact_name("out.txt"),
+    ]
+
+
+def test_s3_cache_bundle_miss(tmp_path, mocker):
+    """A missing tarball is a cache miss. Other errors are raised."""
+    mocker.patch("qik.conf.priv_work_dir", autospec=True, return_value=tmp_path)
+    runnable = mocker.Mock(slug="bundle_miss", cmd="cmd")
+    cache = _s3_cache(bundle=True)
+
+    cache.on_miss(runnable=runnable, hash="hash")
+    assert not cache.base_path(runnable=runnable, hash="hash").exists()
+
+    mocker.patch.object(
+        cache.client.s3_session.meta.client,
+        "download_fileobj",
+        autospec=True,
+        side_effect=botocore.exceptions.ClientError({"Error": {"Code": "500"}}, "HeadObject"),
+    )
+    with pytest.raises(botocore.exceptions.ClientError):
+        cache.on_miss(runnable=runnable, hash="hash")
+
+
+@pytest.mark.parametrize(
+    "name, type, unsafe",
+    [
+        ("out.txt", tarfile.REGTYPE, False),
+        ("/etc/out.txt", tarfile.REGTYPE, True),
+        ("../out.txt", tarfile.REGTYPE, True),
+        ("out.txt", tarfile.SYMTYPE, True),
+        ("out.txt", tarfile.LNKTYPE, True),
+    ],
+)
+def test_s3_cache_checked_members(name, type, unsafe):
+    """Tarball members that escape the extraction directory are rejected."""
+    file = io.BytesIO()
+    with tarfile.open(fileobj=file, mode="w") as tar:
+        member = tarfile.TarInfo(name)
+        member.type = type
+        tar.addfile(member, io.BytesIO(b""))
+
+    file.seek(0)
+    with tarfile.open(fileobj=file, mode="r") as tar:
+        if unsafe:
+            with pytest.raises(tarfile.TarError):
+                qik.s3.cache._checked_members(tar)
+        else:
+            assert qik.s3.cache._checked_members(tar) == tar.getmembers()
+
+
 @contextlib.contextmanager
 def _edit_hello_py() -> Iterator[None]:
     """Edit a/hello.py to break cache."""
@@ -123,6 +243,26 @@ def test_selectors():
     assert shell("qik").returncode == 1
 
 
+def test_cache_status():
+    """Filter several runnables by their cache status."""
+    # Warm the cache. A command fails by design
+    assert shell("qik").returncode == 1
+
+    all_result = shell("qik --ls")
+    warm_result = shell("qik --cache-status warm --cache repo --ls")
+    cold_result = shell("qik --cache-status cold --ls")
+    assert all_result.returncode == 0
+    assert warm_result.returncode == 0
+    assert cold_result.returncode == 0
+
+    all_runnables = set(all_result.stdout.split())
+    warm = set(warm_result.stdout.split())
+    cold = set(cold_result.stdout.split())
+    assert len(warm) > 1
+    assert not warm & cold
+    assert warm | cold <= all_runnables
+
+
 def test_env_ctx():
     """Override qik ctx with env vars."""
     env = os.environ | {
@@ -0,0 +1,34 @@
+import qik.pygraph.core
+
+
+def test_prefix_trie():
+    trie = qik.pygraph.core.PrefixTrie(["a.b", "c"])
+
+    assert trie.has_prefix("a.b")
+    assert trie.has_prefix("a.b.c")
+    assert trie.has_prefix("c")
+    assert trie.has_prefix("c.d.e")
+    assert not trie.has_prefix("a")
+    assert not trie.has_prefix("a.bc")
+    assert not trie.has_prefix("cc")
+    assert not trie.has_prefix("d")
+
+    assert not qik.pygraph.core.PrefixTrie([]).has_prefix("a")
+
+
+def test_upstream_imports_union():
+    modules = [qik.pygraph.core.Module(imp) for imp in ["a", "b", "c", "d"]]
+    graph = qik.pygraph.core.Graph(modules=modules, edges=[(0, 1), (0, 2), (1, 2), (3, 0)])
+
+    assert graph.upstream_imports_union(["a"]) == {
+        (modules[0], modules[1]),
+        (modules[0], modules[2]),
+        (modules[1], modules[2]),
+    }
+    assert graph.upstream_imports_union(["a", "b"]) == graph.upstream_imports_union(["a"])
+    assert graph.upstream_imports_union(["c"]) == set()
+
+    # A depth-first traversal only keeps one edge into "c"
+    assert len(graph.upstream_imports("a")) == 2
+    assert set(graph.upstream_imports("a")) < graph.upstream_imports_union(["a"])
+    assert graph.upstream_modules("a") == {modules[1], modules[2]}
@@ -0,0 +1,18 @@
+import fnmatch
+
+import pytest
+
+import qik.runnable
+
+
+@pytest.mark.parametrize(
+    "glob",
+    ["python_version", "requirements.in", "._qik/artifacts/pygraph.lock/lock.json", "a+b (1)"],
+)
+def test_glob_to_regex_literal(glob):
+    expected = fnmatch.translate(glob).replace("?s:", "^").replace(r"\Z", "$")
+    assert qik.runnable._glob_to_regex(glob) == expected
+
+
+def test_glob_to_regex_wildcard():
+    assert qik.runnable._glob_to_regex("**.py") == "(^.*\\.py)$"
@@ -115,6 +115,7 @@ class Venv(msgspec.Struct, frozen=True, dict=True):
         """Obtain a mapping of modules to their associated python distributions.
 
         This is an expensive command, so use an underlying cache when possible.
+        The mapping is shared by all callers and must not be modified.
         """
         venv_contents = set(os.listdir(self.site_packages_dir)) - {"__pycache__"}
         venv_hash = qik.hash.strs(*sorted(venv_contents))
@@ -127,31 +128,27 @@ class Venv(msgspec.Struct, frozen=True, dict=True):
                     / ".packages_distributions"
                     / f"{self.name}.json"
                 )
-                overrides = (
-                    {}
-                    if not pydist_conf.ignore_missing_modules
-                    else collections.defaultdict(lambda: [""])
-                )
-                overrides |= {module: [dist] for module, dist in pydist_conf.modules.items()}
+                overrides = {module: [dist] for module, dist in pydist_conf.modules.items()}
                 try:
                     cached_val = msgspec.json.decode(
                         cache_path.read_bytes(), type=PackagesDistributions
                     )
-                    if cached_val.venv_hash == venv_hash:
-                        return overrides | cached_val.packages_distributions
                 except FileNotFoundError:
-                    pass
-
-                pkg_to_dist = collections.defaultdict(list)
-                for dist in self.distributions():
-                    for pkg in _top_level_declared(dist) or _top_level_inferred(dist):
-                        pkg_to_dist[pkg].append(dist.metadata["Name"])
-
-                cached_val = PackagesDistributions(
-                    venv_hash=venv_hash,
-                    packages_distributions=dict(pkg_to_dist),
-                )
-                qik.file.write(cache_path, msgspec.json.encode(cached_val))
+                    cached_val = None
+
+                # Only scan the venv when the file cache is missing or stale. Either way,
+                # keep the result in memory so that later calls skip the file cache.
+                if cached_val is None or cached_val.venv_hash != venv_hash:
+                    pkg_to_dist = collections.defaultdict(list)
+                    for dist in self.distributions():
+                        for pkg in _top_level_declared(dist) or _top_level_inferred(dist):
+                            pkg_to_dist[pkg].append(dist.metadata["Name"])
+
+                    cached_val = PackagesDistributions(
+                        venv_hash=venv_hash,
+                        packages_distributions=dict(pkg_to_dist),
+                    )
+                    qik.file.write(cache_path, msgspec.json.encode(cached_val))
 
                 self.__dict__["_packages_distributions"] = (
                     venv_hash,